@@ -0,0 +1,2 @@
+# test_api.py is a manual script that needs a running server, not a pytest module
+collect_ignore = ["test_api.py"]
@@ -0,0 +1,597 @@
+"""
+Load test harness for the Dropout Prediction API
+
+Starts the Flask app locally (or targets an already running server), drives
+/predict and /predict-batch with synthetic student payloads at configurable
+concurrency levels and request-size mixes, and records throughput, latency
+percentiles, error rates and server RSS over time. Results are written as JSON
+so runs against different server configurations or code changes can be
+compared before deploying.
+
+Example:
+    python load_test.py --concurrency 1,8,32 --duration 30 \\
+        --sizes 1:5,10:3,100:1 --output results/baseline.json
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+import numpy as np
+import psutil
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+ENDPOINTS = ("predict", "predict-batch")
+
+# Category values seen in the OULAD data the model was trained on
+CATEGORIES = {
+    "gender": ["M", "F"],
+    "region": [
+        "East Anglian Region", "Scotland", "North Western Region",
+        "South East Region", "West Midlands Region", "Wales",
+        "North Region", "South Region", "Ireland", "South West Region",
+        "East Midlands Region", "Yorkshire Region", "London Region",
+    ],
+    "highest_education": [
+        "HE Qualification", "A Level or Equivalent", "Lower Than A Level",
+        "Post Graduate Qualification", "No Formal quals",
+    ],
+    "imd_band": [
+        "0-10%", "10-20", "20-30%", "30-40%", "40-50%",
+        "50-60%", "60-70%", "70-80%", "80-90%", "90-100%",
+    ],
+    "age_band": ["0-35", "35-55", "55<="],
+    "disability": ["N", "Y"],
+    "code_module": ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG"],
+    "code_presentation": ["2013B", "2013J", "2014B", "2014J"],
+}
+
+FIELDS = [
+    "id_student", "gender", "region", "highest_education", "imd_band",
+    "age_band", "num_of_prev_attempts", "studied_credits", "disability",
+    "code_module", "code_presentation", "date", "sum_click",
+]
+
+
+def parse_sizes(spec):
+    """Parse a size mix like '1:5,10:3,100:1' into [(students, weight), ...]"""
+    sizes = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        students, _, weight = part.partition(":")
+        students, weight = int(students), float(weight or 1)
+        if students < 1 or weight <= 0:
+            raise argparse.ArgumentTypeError(f"Invalid size entry: {part!r}")
+        sizes.append((students, weight))
+    if not sizes:
+        raise argparse.ArgumentTypeError("Size mix must not be empty")
+    return sizes
+
+
+def parse_int_list(spec):
+    """Parse a comma separated list of positive integers"""
+    values = [int(v) for v in spec.split(",") if v.strip()]
+    if not values or any(v < 1 for v in values):
+        raise argparse.ArgumentTypeError(f"Invalid list: {spec!r}")
+    return values
+
+
+def parse_cutoff(value):
+    """Parse a cutoff in days, or 'none' to send requests without one"""
+    if value.strip().lower() == "none":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid cutoff: {value!r}")
+
+
+def positive_int(value):
+    """Parse an integer that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Must be at least 1: {value!r}")
+    return number
+
+
+def non_negative_int(value):
+    """Parse an integer that must be 0 or more"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"Must not be negative: {value!r}")
+    return number
+
+
+def positive_float(value):
+    """Parse a float that must be greater than 0"""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"Must be greater than 0: {value!r}")
+    return number
+
+
+def make_records(num_students, rows_per_student, rng):
+    """Generate synthetic raw activity records for a number of students"""
+    records = []
+    for _ in range(num_students):
+        student = {col: rng.choice(values) for col, values in CATEGORIES.items()}
+        student["id_student"] = rng.randint(10_000, 9_999_999)
+        student["num_of_prev_attempts"] = rng.randint(0, 3)
+        student["studied_credits"] = rng.choice([30, 60, 90, 120])
+        for _ in range(rows_per_student):
+            row = dict(student)
+            row["date"] = rng.randint(-20, 240)
+            row["sum_click"] = rng.randint(1, 50)
+            records.append(row)
+    return records
+
+
+def build_payloads(sizes, rows_per_student, cutoff, rng):
+    """Pre-serialise one CSV and one JSON body per request size"""
+    payloads = {}
+    for students, _ in sizes:
+        records = make_records(students, rows_per_student, rng)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+        body = {"data": records}
+        if cutoff is not None:
+            body["cutoff"] = cutoff
+
+        payloads[students] = {
+            "csv": buffer.getvalue().encode(),
+            "json": json.dumps(body).encode(),
+        }
+    return payloads
+
+
+def latency_stats(samples):
+    """Latency distribution in milliseconds, or None when there are no samples"""
+    if not samples:
+        return None
+    latencies = np.array([s["latency"] for s in samples]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "count": len(samples),
+        "mean": float(latencies.mean()),
+        "min": float(latencies.min()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(latencies.max()),
+    }
+
+
+def summarise(samples, elapsed):
+    """Aggregate request samples into throughput, latency and error stats"""
+    errors = [s for s in samples if s["error"] is not None or s["status"] != 200]
+    successes = [s for s in samples if s["error"] is None and s["status"] == 200]
+    status_counts = {}
+    for s in samples:
+        key = str(s["status"]) if s["status"] is not None else "exception"
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+    return {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(samples) if samples else None,
+        "throughput_rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+        # Fast failures would otherwise inflate throughput and flatter the
+        # percentiles, so successful requests are reported on their own
+        "success_rps": len(successes) / elapsed if elapsed > 0 else 0.0,
+        "status_counts": status_counts,
+        "latency_ms": latency_stats(successes),
+        "error_latency_ms": latency_stats(errors),
+    }
+
+
+class ServerProcess:
+    """Run the API in a subprocess and expose its resident memory"""
+
+    def __init__(self, host, port, command=None):
+        self.host = host
+        self.port = port
+        self.command = command
+        self.proc = None
+        self.log = None
+
+    def check_port_free(self):
+        """Fail if another process is already listening on the target port"""
+        message = (
+            f"Port {self.port} on {self.host} is already in use; "
+            f"stop that server, pick another --port, or use --url to target it"
+        )
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            if sock.connect_ex((self.host, self.port)) == 0:
+                raise RuntimeError(message)
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind((self.host, self.port))
+            except OSError as e:
+                raise RuntimeError(message) from e
+
+    def check_alive(self):
+        """Fail if the server process has exited"""
+        if self.proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {self.proc.returncode}")
+
+    def start(self, log_path):
+        self.check_port_free()
+        if self.command:
+            cmd = shlex.split(self.command.format(host=self.host, port=self.port))
+        else:
+            # Run without the debug reloader so RSS is measured on the serving process
+            cmd = [
+                sys.executable, "-m", "flask", "--app", "app", "run",
+                "--host", self.host, "--port", str(self.port),
+            ]
+        self.log = open(log_path, "w")
+        try:
+            self.proc = subprocess.Popen(
+                cmd, cwd=BACKEND_DIR, stdout=self.log, stderr=subprocess.STDOUT
+            )
+        except OSError as e:
+            self.log.close()
+            raise RuntimeError(f"Could not start server {cmd[0]!r}: {e}") from e
+        return cmd
+
+    def rss(self):
+        """Total RSS in bytes of the server and its worker processes"""
+        try:
+            parent = psutil.Process(self.proc.pid)
+            procs = [parent] + parent.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return None
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        if self.log:
+            self.log.close()
+
+
+async def wait_for_health(session, base_url, timeout, server=None):
+    """Poll /health until the server answers or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.proc.poll() is not None:
+            raise RuntimeError(
+                f"Server exited with code {server.proc.returncode} during startup"
+            )
+        # Bound each poll so a server that accepts but hangs can't outlast the deadline
+        poll_timeout = aiohttp.ClientTimeout(
+            total=max(0.1, min(5.0, deadline - time.monotonic()))
+        )
+        try:
+            async with session.get(f"{base_url}/health", timeout=poll_timeout) as response:
+                if response.status == 200:
+                    health = await response.json()
+                    # A 200 only counts if it came while our own server is still running
+                    if server is not None:
+                        server.check_alive()
+                    return health
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} not healthy after {timeout}s")
+
+
+async def send_request(session, base_url, endpoint, payload, cutoff):
+    """Send a single prediction request and return (status, error)"""
+    if endpoint == "predict":
+        form = aiohttp.FormData()
+        form.add_field(
+            "file", payload["csv"], filename="load_test.csv", content_type="text/csv"
+        )
+        params = {"cutoff": cutoff} if cutoff is not None else None
+        request = session.post(f"{base_url}/predict", data=form, params=params)
+    else:
+        request = session.post(
+            f"{base_url}/predict-batch",
+            data=payload["json"],
+            headers={"Content-Type": "application/json"},
+        )
+
+    async with request as response:
+        body = await response.read()
+        error = None
+        if response.status != 200:
+            try:
+                error = json.loads(body).get("error")
+            except (ValueError, AttributeError):
+                error = body[:200].decode(errors="replace")
+        return response.status, error
+
+
+async def run_level(session, base_url, args, payloads, concurrency, clock_start,
+                    rss_sampler=None):
+    """Drive the API at a fixed concurrency for the configured duration
+
+    clock_start is the monotonic time the run's RSS timeline is measured from,
+    so the level's started_s/finished_s line up with rss_timeline entries.
+    """
+    rng = random.Random(args.seed + concurrency)
+    sizes = [s for s, _ in args.sizes]
+    weights = [w for _, w in args.sizes]
+    endpoints = ENDPOINTS if args.endpoint == "mixed" else (args.endpoint,)
+
+    samples = []
+    dispatched = 0
+    started = time.monotonic()
+    deadline = started + args.duration
+
+    async def worker():
+        nonlocal dispatched
+        while time.monotonic() < deadline:
+            # Count requests as they are sent so in-flight ones respect the cap
+            if args.requests and dispatched >= args.requests:
+                return
+            dispatched += 1
+            endpoint = rng.choice(endpoints)
+            size = rng.choices(sizes, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                status, error = await send_request(
+                    session, base_url, endpoint, payloads[size], args.cutoff
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, error = None, f"{type(e).__name__}: {e}"
+            samples.append({
+                "endpoint": endpoint,
+                "students": size,
+                "status": status,
+                "error": error,
+                "latency": time.perf_counter() - t0,
+                "t": t0,
+            })
+
+    rss_start = len(rss_sampler.samples) if rss_sampler else 0
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    if not samples:
+        raise RuntimeError(f"Level at concurrency {concurrency} completed no requests")
+
+    result = {
+        "concurrency": concurrency,
+        "started_s": round(started - clock_start, 3),
+        "finished_s": round(started + elapsed - clock_start, 3),
+        "duration_s": elapsed,
+    }
+    result.update(summarise(samples, elapsed))
+
+    breakdown = {}
+    for endpoint in endpoints:
+        for size in sizes:
+            subset = [
+                s for s in samples if s["endpoint"] == endpoint and s["students"] == size
+            ]
+            if subset:
+                breakdown[f"{endpoint}:{size}"] = summarise(subset, elapsed)
+    result["breakdown"] = breakdown
+
+    first_errors = {}
+    for s in samples:
+        if s["error"] and s["error"] not in first_errors:
+            first_errors[s["error"]] = s["status"]
+        if len(first_errors) >= 5:
+            break
+    result["sample_errors"] = [
+        {"status": status, "error": error} for error, status in first_errors.items()
+    ]
+
+    level_samples = rss_sampler.samples[rss_start:] if rss_sampler else []
+    rss = [r["rss_bytes"] for r in level_samples if r["rss_bytes"]]
+    result["rss_bytes"] = {"start": rss[0], "end": rss[-1], "max": max(rss)} if rss else None
+    return result
+
+
+class RssSampler:
+    """Periodically record server RSS in the background"""
+
+    def __init__(self, server, interval, clock_start):
+        self.server = server
+        self.interval = interval
+        self.clock_start = clock_start
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            self.samples.append({
+                "t": round(time.monotonic() - self.clock_start, 3),
+                "rss_bytes": self.server.rss(),
+            })
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def print_level(result):
+    latency = result["latency_ms"]
+    percentiles = "  ".join(
+        f"{p}={latency[p]:8.1f}ms" if latency else f"{p}={'n/a':>8}  "
+        for p in ("p50", "p95", "p99")
+    )
+    rss = result["rss_bytes"]
+    rss_text = f"{rss['max'] / 2**20:.1f} MiB" if rss else "n/a"
+    print(
+        f"  concurrency={result['concurrency']:<4} "
+        f"ok_rps={result['success_rps']:8.2f}  "
+        f"rps={result['throughput_rps']:8.2f}  "
+        f"{percentiles}  "
+        f"errors={result['error_rate']:.1%}  "
+        f"max_rss={rss_text}"
+    )
+    for error in result["sample_errors"]:
+        print(f"    ⚠ [{error['status']}] {error['error']}")
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    payloads = build_payloads(args.sizes, args.rows_per_student, args.cutoff, rng)
+
+    server = None
+    server_cmd = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        base_url = f"http://{args.host}:{args.port}"
+        server = ServerProcess(args.host, args.port, args.server_cmd)
+        server_cmd = server.start(args.server_log)
+        print(f"Started server (pid {server.proc.pid}): {' '.join(server_cmd)}")
+
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=0)
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "label": args.label,
+        "config": {
+            "base_url": base_url,
+            "server_command": server_cmd,
+            "endpoint": args.endpoint,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "max_requests": args.requests,
+            "warmup_requests": args.warmup,
+            "sizes": [{"students": s, "weight": w} for s, w in args.sizes],
+            "rows_per_student": args.rows_per_student,
+            "cutoff": args.cutoff,
+            "timeout_s": args.timeout,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+    }
+
+    sampler = None
+    try:
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            report["health"] = await wait_for_health(
+                session, base_url, args.startup_timeout, server
+            )
+            if not report["health"].get("model_loaded"):
+                print("⚠ Server reports model not loaded; predictions will return errors")
+
+            if server:
+                server.check_alive()
+
+            # RSS can only be measured for a server this harness started
+            clock_start = time.monotonic()
+            if server:
+                sampler = RssSampler(server, args.rss_interval, clock_start)
+                sampler.start()
+
+            for i in range(args.warmup):
+                endpoint = ENDPOINTS[i % 2] if args.endpoint == "mixed" else args.endpoint
+                size = args.sizes[i % len(args.sizes)][0]
+                try:
+                    await send_request(session, base_url, endpoint, payloads[size], args.cutoff)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+
+            print(f"\nLoad testing {base_url} ({args.endpoint})")
+            if server:
+                server.check_alive()
+            report["levels"] = []
+            for concurrency in args.concurrency:
+                result = await run_level(
+                    session, base_url, args, payloads, concurrency, clock_start, sampler
+                )
+                report["levels"].append(result)
+                print_level(result)
+    finally:
+        if sampler:
+            await sampler.stop()
+        report["rss_timeline"] = sampler.samples if sampler else None
+        if server:
+            server.stop()
+
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Target an already running server instead of starting one (RSS is not recorded)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--server-cmd", help="Custom command to start the server, run from backend/; {host} and {port} are substituted (e.g. 'gunicorn -w 4 -b {host}:{port} app:app')")
+    parser.add_argument("--server-log", default=os.devnull, help="File to write server output to")
+    parser.add_argument("--startup-timeout", type=positive_float, default=60.0)
+    parser.add_argument("--endpoint", choices=ENDPOINTS + ("mixed",), default="mixed")
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 4, 16], help="Comma separated concurrency levels, run in order (default: 1,4,16)")
+    parser.add_argument("--duration", type=positive_float, default=20.0, help="Seconds to run each concurrency level")
+    parser.add_argument("--requests", type=non_negative_int, default=0, help="Stop a level after this many requests (0 = duration only)")
+    parser.add_argument("--warmup", type=non_negative_int, default=5, help="Requests sent before measuring")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("1:5,10:3,100:1"), help="Request size mix as students:weight pairs (default: 1:5,10:3,100:1)")
+    parser.add_argument("--rows-per-student", type=positive_int, default=30, help="Activity rows generated per student")
+    parser.add_argument("--cutoff", type=parse_cutoff, default=60, help="Days of activity to consider, or 'none' to send no cutoff (default: 60)")
+    parser.add_argument("--timeout", type=positive_float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--rss-interval", type=positive_float, default=0.5, help="Seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="Free-form label stored in the results, e.g. a server config name")
+    parser.add_argument("--output", default="load_test_results.json", help="Path to write the JSON results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("\n🚀 Starting API Load Test\n")
+
+    try:
+        report = asyncio.run(run(args))
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nInterrupted.")
+        sys.exit(130)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n✅ Results saved to {output}")
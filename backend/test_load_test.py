@@ -0,0 +1,106 @@
+"""
+Tests for the load test harness helpers (no server required)
+"""
+import argparse
+import asyncio
+import time
+
+import pytest
+
+import load_test
+
+
+def sample(status=200, error=None, latency=0.1):
+    return {"status": status, "error": error, "latency": latency}
+
+
+def test_parse_sizes():
+    assert load_test.parse_sizes("1:5, 10:3,100") == [(1, 5.0), (10, 3.0), (100, 1.0)]
+    for spec in ("", "0:1", "5:0", "5:-1"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            load_test.parse_sizes(spec)
+
+
+def test_parse_cutoff():
+    assert load_test.parse_cutoff("60") == 60
+    assert load_test.parse_cutoff("None") is None
+    with pytest.raises(argparse.ArgumentTypeError):
+        load_test.parse_cutoff("abc")
+
+
+def test_parse_args_rejects_out_of_range_values():
+    for argv in (
+        ["--requests", "-1"], ["--warmup", "-1"], ["--timeout", "-5"],
+        ["--startup-timeout", "0"], ["--duration", "0"], ["--rss-interval", "0"],
+        ["--rows-per-student", "0"],
+    ):
+        with pytest.raises(SystemExit):
+            load_test.parse_args(argv)
+    assert load_test.parse_args(["--cutoff", "none"]).cutoff is None
+
+
+def test_summarise_separates_successes_from_errors():
+    samples = [sample(500, "Model not loaded", 0.001)] * 3 + [sample(latency=0.2)]
+    summary = load_test.summarise(samples, elapsed=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == 3
+    assert summary["error_rate"] == 0.75
+    assert summary["throughput_rps"] == 2.0
+    assert summary["success_rps"] == 0.5
+    assert summary["status_counts"] == {"500": 3, "200": 1}
+    assert summary["latency_ms"]["count"] == 1
+    assert summary["latency_ms"]["p50"] == pytest.approx(200.0)
+    assert summary["error_latency_ms"]["count"] == 3
+    assert summary["error_latency_ms"]["p99"] == pytest.approx(1.0)
+
+
+def test_summarise_counts_exceptions_as_errors():
+    summary = load_test.summarise([sample(None, "ClientError: boom")], elapsed=1.0)
+
+    assert summary["status_counts"] == {"exception": 1}
+    assert summary["error_rate"] == 1.0
+    assert summary["success_rps"] == 0.0
+    assert summary["latency_ms"] is None
+
+
+def test_summarise_empty():
+    summary = load_test.summarise([], elapsed=1.0)
+
+    assert summary["error_rate"] is None
+    assert summary["latency_ms"] is None
+
+
+def run_level(monkeypatch, concurrency, requests, duration=5.0, status=200):
+    async def fake_send(session, base_url, endpoint, payload, cutoff):
+        await asyncio.sleep(0.01)
+        return status, None if status == 200 else "failed"
+
+    monkeypatch.setattr(load_test, "send_request", fake_send)
+    args = load_test.parse_args([
+        "--requests", str(requests), "--duration", str(duration), "--sizes", "1:1,5:1",
+    ])
+    payloads = {1: {}, 5: {}}
+    return asyncio.run(load_test.run_level(
+        None, "http://test", args, payloads, concurrency, time.monotonic()
+    ))
+
+
+def test_run_level_caps_dispatched_requests(monkeypatch):
+    result = run_level(monkeypatch, concurrency=16, requests=10)
+
+    assert result["requests"] == 10
+    assert result["rss_bytes"] is None
+    assert 0 <= result["started_s"] <= result["finished_s"]
+
+
+def test_run_level_reports_sample_errors(monkeypatch):
+    result = run_level(monkeypatch, concurrency=2, requests=4, status=500)
+
+    assert result["error_rate"] == 1.0
+    assert result["sample_errors"] == [{"status": 500, "error": "failed"}]
+
+
+def test_run_level_without_requests_fails(monkeypatch):
+    with pytest.raises(RuntimeError):
+        run_level(monkeypatch, concurrency=1, requests=0, duration=1e-9)